@@ -6,28 +6,40 @@ This script reads the pacman log file, parses package installation/upgrade/remov
 events, and displays them in a formatted way with the option to export to a text file.
 """
 
+import mmap
 import os
+import pickle
 import re
 import shutil
 import subprocess
 import sys
-from datetime import datetime
+import tempfile
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import chain, repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 import argparse
 
-try:
-    import tkinter as tk
-    from tkinter import messagebox
-    TKINTER_AVAILABLE = True
-except ImportError:
-    TKINTER_AVAILABLE = False
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
+# rich, tkinter and the process pool are imported where they are first needed;
+# tkinter in particular loads the Tcl/Tk libraries and is only used for the popup
+_console = None
+
+
+def get_console():
+    """Return the shared rich Console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+# (timestamp, action, package, version, date_str, time_str)
+LogEntry = Tuple[datetime, str, str, str, str, str]
 
 
 class Config:
@@ -35,8 +47,27 @@ class Config:
     
     LOG_PATH = "/var/log/pacman.log"
     LOG_PATTERN = re.compile(
-        r"\[(.*?)\] \[ALPM\] (installed|upgraded|removed) ([^\s]+) \((.*?)\)"
+        rb"\[([^\]]+)\] \[ALPM\] (installed|upgraded|removed) (\S+) \(([^)]+)\)"
+    )
+    ALPM_MARKER = b"] [ALPM] "
+    # Maps raw action tokens to shared str objects so entries don't each hold a copy
+    LOG_ACTIONS = {
+        b"installed": "installed",
+        b"upgraded": "upgraded",
+        b"removed": "removed",
+    }
+    # Logs smaller than this are parsed in-process; worker startup would dominate
+    PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+    # Parsed entries are cached so later runs only parse what was appended since
+    CACHE_PATH = os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+        "cachyupdate",
+        "entries.pickle",
     )
+    CACHE_VERSION = 1
+    CACHE_CHECK_BYTES = 64
+    # Large write buffer so the export reaches the disk in a few big writes
+    EXPORT_BUFFER_SIZE = 1 << 20
     LOCAL_TZ = ZoneInfo("Europe/Berlin")  # Adjust if needed
     
     ACTION_ICONS = {
@@ -52,46 +83,257 @@ class Config:
     }
 
 
+# Action labels for the export and the terminal table, formatted once at import
+_ACTION_PADDED = {
+    act: f"{icon} {act.upper()}".ljust(15) for act, icon in Config.ACTION_ICONS.items()
+}
+_ACTION_MARKUP = {
+    act: f"[{Config.ACTION_COLORS[act]}]{icon} {act.capitalize()}[/{Config.ACTION_COLORS[act]}]"
+    for act, icon in Config.ACTION_ICONS.items()
+}
+
+
+def _is_downgrade(version: str) -> bool:
+    """Check whether a version string marks a downgrade."""
+    # Plain substring checks avoid allocating a lowercased copy for every row
+    return (
+        "downgrade" in version
+        or "Downgrade" in version
+        or "DOWNGRADE" in version
+        or "↓" in version
+    )
+
+
 class PacmanLogParser:
     """Handles parsing of pacman log files."""
     
-    def __init__(self, log_path: str = Config.LOG_PATH):
+    def __init__(self, log_path: str = Config.LOG_PATH, cache_path: Optional[str] = Config.CACHE_PATH):
         self.log_path = log_path
-        self.console = Console()
+        self.cache_path = cache_path
     
-    def parse_log(self) -> List[Tuple[datetime, str, str, str]]:
+    def parse_log(self) -> List[LogEntry]:
         """
         Parse the pacman log file and extract package events.
         
         Returns:
-            List of tuples containing (timestamp, action, package, version)
+            List of tuples containing (timestamp, action, package, version, date_str, time_str)
         """
-        entries = []
-        
         try:
-            with open(self.log_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    match = Config.LOG_PATTERN.search(line)
-                    if match:
-                        raw_time, action, package, version = match.groups()
-                        timestamp = self._parse_timestamp(raw_time)
-                        version_str = self._format_version(action, version)
-                        entries.append((timestamp, action, package, version_str))
+            with open(self.log_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                size = stat.st_size
+                # mmap refuses to map an empty file
+                if size == 0:
+                    return []
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    tail = mm[max(0, size - Config.CACHE_CHECK_BYTES):size]
+                    # The log is append-only, so only the bytes after the cached prefix are parsed
+                    entries, offset = self._load_cache(stat, mm)
+                    bounds = self._chunk_bounds(mm, offset, size)
+                    if len(bounds) == 1:
+                        entries.extend(self._parse_buffer(mm, offset, size))
+            
+            if len(bounds) > 1:
+                # Lines are independent, so large logs are split across processes
+                from concurrent.futures import ProcessPoolExecutor
+                
+                starts, ends = zip(*bounds)
+                with ProcessPoolExecutor(max_workers=len(bounds)) as pool:
+                    chunks = pool.map(_parse_log_range, repeat(self.log_path), starts, ends)
+                    entries.extend(chain.from_iterable(chunks))
+            
+            if offset < size:
+                self._save_cache(stat, tail, entries)
         except FileNotFoundError:
-            self.console.print(f"[bold red]Error: Log file not found at {self.log_path}[/]")
+            get_console().print(f"[bold red]Error: Log file not found at {self.log_path}[/]")
             return []
         except PermissionError:
-            self.console.print(f"[bold red]Error: Permission denied reading {self.log_path}[/]")
+            get_console().print(f"[bold red]Error: Permission denied reading {self.log_path}[/]")
             return []
         except Exception as e:
-            self.console.print(f"[bold red]Error reading log file: {e}[/]")
+            get_console().print(f"[bold red]Error reading log file: {e}[/]")
             return []
         
-        # Sort by timestamp in descending order (newest first)
+        # Sort by timestamp in descending order (newest first). The sort is stable,
+        # so events from the same second keep their file order, and it stays
+        # correct when the clock jumped backwards while the log was written
         return sorted(entries, key=lambda x: x[0], reverse=True)
     
+    def _load_cache(self, stat: os.stat_result, buf) -> Tuple[List[LogEntry], int]:
+        """
+        Load the entries cached by a previous run.
+        
+        Returns:
+            The cached entries in file order and the log offset they cover,
+            or an empty list and offset 0 if the cache is missing or stale
+        """
+        if not self.cache_path:
+            return [], 0
+        
+        try:
+            with open(self.cache_path, "rb") as f:
+                state = pickle.load(f)
+            offset = state["log_size"]
+            # A shrunk or replaced log invalidates the cache. Only the last
+            # CACHE_CHECK_BYTES before the offset are compared, so this relies on
+            # pacman.log being append-only; edits further back go unnoticed
+            valid = (
+                state["version"] == Config.CACHE_VERSION
+                and state["log_path"] == self.log_path
+                and state["local_tz"] == Config.LOCAL_TZ.key
+                and state["log_inode"] == stat.st_ino
+                and state["log_mtime_ns"] <= stat.st_mtime_ns
+                and offset <= stat.st_size
+                and buf[max(0, offset - Config.CACHE_CHECK_BYTES):offset] == state["log_tail"]
+            )
+        except Exception:
+            return [], 0
+        
+        return (state["entries"], offset) if valid else ([], 0)
+    
+    def _save_cache(self, stat: os.stat_result, tail: bytes, entries: List[LogEntry]) -> None:
+        """Cache the entries parsed so far together with the log state they cover."""
+        # Only cache up to a complete line so the next run resumes on a line boundary
+        if not self.cache_path or not tail.endswith(b"\n"):
+            return
+        
+        state = {
+            "version": Config.CACHE_VERSION,
+            "log_path": self.log_path,
+            "local_tz": Config.LOCAL_TZ.key,
+            "log_inode": stat.st_ino,
+            "log_mtime_ns": stat.st_mtime_ns,
+            "log_size": stat.st_size,
+            "log_tail": tail,
+            "entries": entries,
+        }
+        tmp_path = None
+        try:
+            cache_dir = os.path.dirname(self.cache_path)
+            FileManager.ensure_directory_exists(cache_dir)
+            # A unique temp file keeps concurrent runs from writing into the same file
+            with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                pickle.dump(state, f, protocol=5)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            if tmp_path:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            get_console().print(f"[yellow]Warning: Could not write cache: {e}[/]")
+    
+    def _chunk_bounds(self, buf, start: int, end: int) -> List[Tuple[int, int]]:
+        """Split buf[start:end] into one line-aligned (start, end) range per CPU."""
+        try:
+            # Only count the CPUs this process may run on (taskset, containers)
+            workers = len(os.sched_getaffinity(0))
+        except AttributeError:
+            workers = os.cpu_count() or 1
+        size = end - start
+        if size < Config.PARALLEL_MIN_BYTES or workers < 2:
+            return [(start, end)]
+        
+        bounds = []
+        chunk_start = start
+        for i in range(1, workers):
+            cut = buf.find(b"\n", max(chunk_start, start + size * i // workers), end) + 1
+            if cut == 0:
+                break
+            bounds.append((chunk_start, cut))
+            chunk_start = cut
+        if chunk_start < end:
+            bounds.append((chunk_start, end))
+        return bounds
+    
+    def _parse_buffer(self, buf, start: int, end: int) -> List[LogEntry]:
+        """Parse the package events found in buf[start:end] in file order."""
+        entries = []
+        # Only a few hundred distinct dates exist, so share one string per date
+        dates = {}
+        
+        # This loop runs once per ALPM line; bind everything it calls to locals
+        # so each iteration skips the attribute and global lookups
+        append = entries.append
+        share_date = dates.setdefault
+        actions = Config.LOG_ACTIONS
+        split_line = self._split_alpm_line
+        parse_timestamp = self._parse_timestamp
+        format_version = self._format_version
+        
+        # Only ALPM lines are visited, so only their fields are decoded
+        for line in self._iter_alpm_lines(buf, start, end):
+            fields = split_line(line)
+            if fields is None:
+                continue
+            raw_time, action, package, version = fields
+            action = actions[action]
+            timestamp = parse_timestamp(raw_time.decode("utf-8"))
+            # Formatting from the int fields is much cheaper than strftime
+            date_str = f"{timestamp.year:04d}-{timestamp.month:02d}-{timestamp.day:02d}"
+            time_str = f"{timestamp.hour:02d}:{timestamp.minute:02d}:{timestamp.second:02d}"
+            append((
+                timestamp,
+                action,
+                package.decode("utf-8"),
+                format_version(action, version.decode("utf-8")),
+                share_date(date_str, date_str),
+                time_str,
+            ))
+        return entries
+    
+    def _iter_alpm_lines(self, buf, start: int, end: int) -> Iterator[bytes]:
+        """Yield every line of buf[start:end] that contains the ALPM marker."""
+        find = buf.find
+        pos = find(Config.ALPM_MARKER, start, end)
+        while pos != -1:
+            line_start = buf.rfind(b"\n", start, pos) + 1 or start
+            line_end = find(b"\n", pos, end)
+            if line_end == -1:
+                line_end = end
+            yield buf[line_start:line_end]
+            pos = find(Config.ALPM_MARKER, line_end, end)
+    
+    def _split_alpm_line(self, line: bytes) -> Optional[Tuple[bytes, bytes, bytes, bytes]]:
+        """
+        Split an ALPM line into (raw_time, action, package, version).
+        
+        Well-formed lines are split on spaces; anything else falls back to the regex.
+        Returns None for ALPM lines that are not package events.
+        """
+        parts = line.split(b" ", 4)
+        if len(parts) == 5 and parts[1] == b"[ALPM]":
+            raw_time, _, action, package, version = parts
+            if raw_time[:1] == b"[" and raw_time[-1:] == b"]":
+                if action not in Config.LOG_ACTIONS:
+                    return None
+                if package and version[:1] == b"(" and version.find(b")") == len(version) - 1:
+                    return raw_time[1:-1], action, package, version[1:-1]
+        
+        match = Config.LOG_PATTERN.search(line)
+        return match.groups() if match else None
+    
     def _parse_timestamp(self, raw_time: str) -> datetime:
         """Parse timestamp string to datetime object."""
+        # Fast path: pacman writes fixed-width YYYY-MM-DDTHH:MM:SS[+-]HHMM stamps
+        if len(raw_time) in (19, 24) and raw_time[10] == "T":
+            if len(raw_time) == 19:
+                tz = Config.LOCAL_TZ
+            else:
+                tz = self._utc_offset(raw_time[19:])
+                if tz is not None and self._is_local_offset(raw_time[:10], tz):
+                    # Already local time, so no conversion is needed
+                    tz = Config.LOCAL_TZ
+            if tz is not None:
+                timestamp = datetime(
+                    int(raw_time[0:4]), int(raw_time[5:7]), int(raw_time[8:10]),
+                    int(raw_time[11:13]), int(raw_time[14:16]), int(raw_time[17:19]),
+                    tzinfo=tz,
+                )
+                return timestamp if tz is Config.LOCAL_TZ else timestamp.astimezone(Config.LOCAL_TZ)
+        
         try:
             # Try parsing with timezone first
             timestamp = datetime.strptime(raw_time, "%Y-%m-%dT%H:%M:%S%z")
@@ -103,6 +345,34 @@ class PacmanLogParser:
         # Convert to local timezone for consistent display
         return timestamp.astimezone(Config.LOCAL_TZ)
     
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _utc_offset(offset: str) -> Optional[timezone]:
+        """Return the fixed timezone for a +HHMM/-HHMM suffix, or None if malformed."""
+        if offset[0] not in "+-" or not offset[1:].isdigit():
+            return None
+        delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+        return timezone(-delta if offset[0] == "-" else delta)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _is_local_offset(day: str, tz: timezone) -> bool:
+        """
+        Check whether LOCAL_TZ uses exactly this UTC offset for the whole day.
+        
+        The offset only changes at DST transitions, so the answer is cached per
+        YYYY-MM-DD day. Days that contain a transition report False and take
+        the astimezone path, which handles skipped and repeated local times.
+        """
+        expected = tz.utcoffset(None)
+        start = datetime(int(day[0:4]), int(day[5:7]), int(day[8:10]), tzinfo=Config.LOCAL_TZ)
+        end = start.replace(hour=23, minute=59, second=59)
+        return all(
+            moment.replace(fold=fold).utcoffset() == expected
+            for moment in (start, end)
+            for fold in (0, 1)
+        )
+    
     def _format_version(self, action: str, version: str) -> str:
         """Format version string based on action type."""
         if action == "upgraded":
@@ -111,6 +381,13 @@ class PacmanLogParser:
         return version
 
 
+def _parse_log_range(log_path: str, start: int, end: int) -> List[LogEntry]:
+    """Parse one line-aligned byte range of the log inside a worker process."""
+    with open(log_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return PacmanLogParser(log_path)._parse_buffer(mm, start, end)
+
+
 class FileManager:
     """Handles file operations and document folder detection."""
     
@@ -141,16 +418,15 @@ class FileManager:
 class HistoryExporter:
     """Handles exporting history data to text files."""
     
-    def __init__(self):
-        self.console = Console()
-    
-    def save_to_text_file(self, entries: List[Tuple[datetime, str, str, str]], 
+    def save_to_text_file(self, daily_entries: Dict[str, List[LogEntry]], 
+                         daily_counts: Dict[str, Counter],
                          filename: Optional[str] = None) -> str:
         """
         Save all entries to a text file with proper formatting.
         
         Args:
-            entries: List of parsed log entries
+            daily_entries: Parsed log entries grouped by date, newest first
+            daily_counts: Per-date action counts
             filename: Optional custom filename
             
         Returns:
@@ -162,131 +438,95 @@ class HistoryExporter:
             filename = os.path.join(documents, "pacman_history.txt")
         
         try:
-            with open(filename, "w", encoding="utf-8") as f:
+            with open(filename, "w", encoding="utf-8", buffering=Config.EXPORT_BUFFER_SIZE) as f:
                 self._write_header(f)
-                self._write_entries(f, entries)
-                self._write_overall_summary(f, entries)
+                self._write_entries(f, daily_entries, daily_counts)
+                self._write_overall_summary(f, daily_counts)
             
             return filename
         except Exception as e:
-            self.console.print(f"[bold red]Error saving file: {e}[/]")
+            get_console().print(f"[bold red]Error saving file: {e}[/]")
             raise
     
     def _write_header(self, file) -> None:
         """Write the file header."""
-        file.write("PACMAN UPDATE HISTORY\n")
-        file.write("=" * 50 + "\n\n")
+        file.write("PACMAN UPDATE HISTORY\n" + "=" * 50 + "\n\n")
     
-    def _write_entries(self, file, entries: List[Tuple[datetime, str, str, str]]) -> None:
+    def _write_entries(self, file, daily_entries: Dict[str, List[LogEntry]],
+                       daily_counts: Dict[str, Counter]) -> None:
         """Write all entries grouped by date."""
-        daily_entries = self._group_entries_by_date(entries)
-        sorted_dates = sorted(daily_entries.keys(), reverse=True)
-        
-        for date_str in sorted_dates:
-            day_entries = daily_entries[date_str]
-            day_entries.sort(key=lambda x: x[0], reverse=True)
-            
-            self._write_date_section(file, date_str, day_entries)
-    
-    def _group_entries_by_date(self, entries: List[Tuple[datetime, str, str, str]]) -> Dict[str, List]:
-        """Group entries by date."""
-        daily_entries = {}
-        for timestamp, action, package, version in entries:
-            date_str = timestamp.strftime("%Y-%m-%d")
-            if date_str not in daily_entries:
-                daily_entries[date_str] = []
-            daily_entries[date_str].append((timestamp, action, package, version))
-        return daily_entries
-    
-    def _write_date_section(self, file, date_str: str, day_entries: List[Tuple[datetime, str, str, str]]) -> None:
+        for date_str, day_entries in daily_entries.items():
+            self._write_date_section(file, date_str, day_entries, daily_counts[date_str])
+    
+    def _write_date_section(self, file, date_str: str, day_entries: List[LogEntry],
+                            day_counts: Counter) -> None:
         """Write entries for a specific date."""
-        file.write(f"DATE: {date_str}\n")
-        file.write("-" * 30 + "\n")
+        icon_of = Config.ACTION_ICONS.get
         
-        daily_counts = {"installed": 0, "upgraded": 0, "removed": 0}
-        
-        # Write entries
-        for timestamp, action, package, version in day_entries:
-            time_str = timestamp.strftime("%H:%M:%S")
-            
-            if action in daily_counts:
-                daily_counts[action] += 1
-            
-            icon = Config.ACTION_ICONS.get(action, "❔")
-            action_display = f"{icon} {action.upper()}"
-            
-            suspicious = "↓" in version or "downgrade" in version.lower()
-            version_display = f"[DOWNGRADE] {version}" if suspicious else version
-            
-            file.write(f"{time_str} | {action_display:<15} | {package:<30} | {version_display}\n")
+        # Build the whole section as one string and hand it to the file in one call
+        parts = [f"DATE: {date_str}\n", "-" * 30 + "\n"]
+        parts.extend([
+            f"{time_str} | {_ACTION_PADDED[action]} | {package.ljust(30)} | "
+            f"{'[DOWNGRADE] ' if _is_downgrade(version) else ''}{version}\n"
+            for _, action, package, version, _, time_str in day_entries
+        ])
         
         # Write daily summary
-        file.write("\nSUMMARY:\n")
-        for act, count in daily_counts.items():
+        parts.append("\nSUMMARY:\n")
+        for act in Config.ACTION_ICONS:
+            count = day_counts[act]
             if count > 0:
-                icon = Config.ACTION_ICONS.get(act, "")
-                file.write(f"  {icon} {act.capitalize()}: {count}\n")
+                parts.append(f"  {icon_of(act, '')} {act.capitalize()}: {count}\n")
         
-        file.write("\n" + "=" * 50 + "\n\n")
+        parts.append("\n" + "=" * 50 + "\n\n")
+        file.write("".join(parts))
     
-    def _write_overall_summary(self, file, entries: List[Tuple[datetime, str, str, str]]) -> None:
+    def _write_overall_summary(self, file, daily_counts: Dict[str, Counter]) -> None:
         """Write overall summary statistics."""
-        total_counts = {"installed": 0, "upgraded": 0, "removed": 0}
-        for _, action, _, _ in entries:
-            if action in total_counts:
-                total_counts[action] += 1
-        
-        file.write("OVERALL SUMMARY:\n")
-        file.write("-" * 20 + "\n")
-        for act, count in total_counts.items():
-            icon = Config.ACTION_ICONS.get(act, "")
-            file.write(f"{icon} {act.capitalize()}: {count}\n")
+        # Summing the per-date counts avoids another pass over every entry
+        total_counts = Counter()
+        for day_counts in daily_counts.values():
+            total_counts.update(day_counts)
+        
+        icon_of = Config.ACTION_ICONS.get
+        parts = ["OVERALL SUMMARY:\n", "-" * 20 + "\n"]
+        for act in Config.ACTION_ICONS:
+            parts.append(f"{icon_of(act, '')} {act.capitalize()}: {total_counts[act]}\n")
+        file.write("".join(parts))
 
 
 class HistoryDisplay:
     """Handles displaying history data in the terminal."""
     
-    def __init__(self):
-        self.console = Console()
-    
-    def display_updates(self, entries: List[Tuple[datetime, str, str, str]]) -> None:
+    def display_updates(self, daily_entries: Dict[str, List[LogEntry]],
+                        daily_counts: Dict[str, Counter]) -> None:
         """
         Display package updates in a formatted table.
         
         Args:
-            entries: List of parsed log entries
+            daily_entries: Parsed log entries grouped by date, newest first
+            daily_counts: Per-date action counts
         """
-        if not entries:
-            self.console.print("[bold yellow]No package changes found in pacman.log.[/]")
+        if not daily_entries:
+            get_console().print("[bold yellow]No package changes found in pacman.log.[/]")
             return
         
-        daily_entries = self._group_entries_by_date(entries)
-        sorted_dates = sorted(daily_entries.keys(), reverse=True)
-        
-        for date_str in sorted_dates:
-            day_entries = daily_entries[date_str]
-            day_entries.sort(key=lambda x: x[0], reverse=True)
-            
-            self._display_date_section(date_str, day_entries)
-    
-    def _group_entries_by_date(self, entries: List[Tuple[datetime, str, str, str]]) -> Dict[str, List]:
-        """Group entries by date."""
-        daily_entries = {}
-        for timestamp, action, package, version in entries:
-            date_str = timestamp.strftime("%Y-%m-%d")
-            if date_str not in daily_entries:
-                daily_entries[date_str] = []
-            daily_entries[date_str].append((timestamp, action, package, version))
-        return daily_entries
-    
-    def _display_date_section(self, date_str: str, day_entries: List[Tuple[datetime, str, str, str]]) -> None:
+        for date_str, day_entries in daily_entries.items():
+            self._display_date_section(date_str, day_entries, daily_counts[date_str])
+    
+    def _display_date_section(self, date_str: str, day_entries: List[LogEntry],
+                              day_counts: Counter) -> None:
         """Display entries for a specific date."""
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+        
         # Print date header
         panel = Panel(
             Text(date_str, justify="center", style="bold white on blue"), 
             expand=False
         )
-        self.console.print(panel)
+        get_console().print(panel)
         
         # Create table
         table = Table(show_header=True, header_style="bold cyan", box=None, expand=True)
@@ -295,38 +535,33 @@ class HistoryDisplay:
         table.add_column("Package", style="bold white")
         table.add_column("Version Info", style="dim")
         
-        daily_counts = {"installed": 0, "upgraded": 0, "removed": 0}
-        
         # Add entries to table
-        for timestamp, action, package, version in day_entries:
-            time_str = timestamp.strftime("%H:%M:%S")
-            
-            if action in daily_counts:
-                daily_counts[action] += 1
-            
-            icon = Config.ACTION_ICONS.get(action, "❔")
-            color = Config.ACTION_COLORS.get(action, "white")
-            action_text = f"[{color}]{icon} {action.capitalize()}[/{color}]"
+        for _, action, package, version, _, time_str in day_entries:
+            action_text = _ACTION_MARKUP[action]
             
-            suspicious = "↓" in version or "downgrade" in version.lower()
+            suspicious = _is_downgrade(version)
             version_display = f"[bold red]{version}[/bold red]" if suspicious else version
             
             table.add_row(time_str, action_text, package, version_display)
         
         # Print table
-        self.console.print(table)
+        get_console().print(table)
         
         # Print summary
-        self._display_daily_summary(date_str, daily_counts)
+        self._display_daily_summary(date_str, day_counts)
     
-    def _display_daily_summary(self, date_str: str, daily_counts: Dict[str, int]) -> None:
+    def _display_daily_summary(self, date_str: str, day_counts: Counter) -> None:
         """Display summary for a specific date."""
+        from rich.panel import Panel
+        from rich.text import Text
+        
         summary_text = Text()
-        for act, count in daily_counts.items():
+        icon_of = Config.ACTION_ICONS.get
+        color_of = Config.ACTION_COLORS.get
+        for act in Config.ACTION_ICONS:
+            count = day_counts[act]
             if count > 0:
-                color = Config.ACTION_COLORS.get(act, "white")
-                icon = Config.ACTION_ICONS.get(act, "")
-                summary_text.append(f"{icon} {act.capitalize()}: {count}  ", style=color)
+                summary_text.append(f"{icon_of(act, '')} {act.capitalize()}: {count}  ", style=color_of(act, "white"))
         
         if summary_text.plain:
             panel = Panel(
@@ -335,15 +570,12 @@ class HistoryDisplay:
                 expand=False, 
                 border_style="bright_blue"
             )
-            self.console.print(panel)
+            get_console().print(panel)
 
 
 class NotificationManager:
     """Handles user notifications and file opening."""
     
-    def __init__(self):
-        self.console = Console()
-    
     def show_popup(self, filename: str) -> None:
         """
         Show a popup notification about the saved file.
@@ -387,7 +619,7 @@ class NotificationManager:
     
     def _try_tkinter_popup(self, abs_path: str) -> bool:
         """Try to show popup using Tkinter."""
-        if not TKINTER_AVAILABLE or not os.environ.get("DISPLAY"):
+        if not os.environ.get("DISPLAY"):
             return False
         
         try:
@@ -398,6 +630,8 @@ class NotificationManager:
     
     def _create_tkinter_popup(self, abs_path: str) -> None:
         """Create and show Tkinter popup."""
+        import tkinter as tk
+        
         def open_file():
             try:
                 subprocess.Popen(["xdg-open", abs_path])
@@ -437,30 +671,57 @@ class NotificationManager:
         try:
             subprocess.Popen(["xdg-open", filepath])
         except Exception as e:
-            self.console.print(f"[yellow]Warning: Could not open file: {e}[/]")
+            get_console().print(f"[yellow]Warning: Could not open file: {e}[/]")
     
     def _print_fallback_message(self, abs_path: str) -> None:
         """Print fallback message to console."""
-        self.console.print(f"[green]History saved to: {abs_path}[/]")
-        self.console.print(f"[dim]To open the file: xdg-open '{abs_path}'[/]")
+        get_console().print(f"[green]History saved to: {abs_path}[/]")
+        get_console().print(f"[dim]To open the file: xdg-open '{abs_path}'[/]")
 
 
 def filter_entries(entries, start_date=None, end_date=None, package=None, operation=None, limit=None):
-    filtered = []
+    """Lazily yield the entries that pass every given filter, stopping after limit."""
+    # Per-call work is done once up front; ISO date strings compare like dates
+    start_str = start_date.isoformat() if start_date else None
+    end_str = end_date.isoformat() if end_date else None
+    needle = package.lower() if package else None
+    
+    yielded = 0
     for entry in entries:
-        timestamp, action, pkg, version = entry
-        if start_date and timestamp.date() < start_date:
-            continue
-        if end_date and timestamp.date() > end_date:
+        _, action, pkg, _, date_str, _ = entry
+        if end_str and date_str > end_str:
             continue
-        if package and package.lower() not in pkg.lower():
+        if start_str and date_str < start_str:
             continue
         if operation and action != operation:
             continue
-        filtered.append(entry)
-    if limit:
-        filtered = filtered[:limit]
-    return filtered
+        if needle and needle not in pkg.lower():
+            continue
+        yield entry
+        yielded += 1
+        if limit and yielded >= limit:
+            return
+
+
+def group_entries_by_date(entries: Iterable[LogEntry]) -> Tuple[Dict[str, List[LogEntry]], Dict[str, Counter]]:
+    """
+    Group entries by date and count each date's actions in the same pass.
+    
+    Entries arrive newest first, so both the dates and each day's entries
+    keep that order without any further sorting.
+    
+    Returns:
+        The entries grouped by date and the per-date action counts
+    """
+    daily_entries = defaultdict(list)
+    daily_counts = defaultdict(Counter)
+    day_of = daily_entries.__getitem__
+    counts_of = daily_counts.__getitem__
+    for entry in entries:
+        date_str = entry[4]
+        day_of(date_str).append(entry)
+        counts_of(date_str)[entry[1]] += 1
+    return daily_entries, daily_counts
 
 
 def main():
@@ -473,11 +734,15 @@ def main():
     parser.add_argument("--limit", type=int, help="Limit number of entries shown")
     parser.add_argument("--export", type=str, help="Export to text file")
     parser.add_argument("--no-notifications", action="store_true", help="Disable desktop notifications")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse the whole log instead of using the cache")
     args = parser.parse_args()
+    # filter_entries streams its results, so it cannot drop entries from the end
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit must not be negative")
 
     try:
         # Parse pacman log
-        log_parser = PacmanLogParser()
+        log_parser = PacmanLogParser(cache_path=None if args.no_cache else Config.CACHE_PATH)
         entries = log_parser.parse_log()
 
         if not entries:
@@ -491,18 +756,19 @@ def main():
         operation = args.operation
         limit = args.limit
 
-        # Filter entries
+        # Filter and group in a single pass; the result feeds both the export and the display
         filtered_entries = filter_entries(entries, start_date, end_date, package, operation, limit)
+        daily_entries, daily_counts = group_entries_by_date(filtered_entries)
 
         # Always export to file unless --export is specified
         exporter = HistoryExporter()
         if args.export:
-            filename = exporter.save_to_text_file(filtered_entries, args.export)
+            filename = exporter.save_to_text_file(daily_entries, daily_counts, args.export)
         else:
             documents = FileManager.get_documents_folder()
             FileManager.ensure_directory_exists(documents)
             filename = os.path.join(documents, "pacman_history.txt")
-            exporter.save_to_text_file(filtered_entries, filename)
+            exporter.save_to_text_file(daily_entries, daily_counts, filename)
 
         # Show notification or print message
         if not args.no_notifications:
@@ -513,7 +779,7 @@ def main():
 
         # Display in terminal
         display = HistoryDisplay()
-        display.display_updates(filtered_entries)
+        display.display_updates(daily_entries, daily_counts)
 
         # Always print a message at the end
         print(f"\n[INFO] Pacman history exported to: {filename}")
@@ -526,4 +792,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for the parse workers in the frozen PyInstaller binary
+    from multiprocessing import freeze_support
+    freeze_support()
     main()